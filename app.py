@@ -13,10 +13,10 @@ Configuration:
 - For production, set debug=False and consider using environment variables for configuration.
 """
 
-from flask import Flask, request, jsonify, make_response
+from flask import Flask, request, jsonify, make_response, Response
 import json
-from collections import defaultdict
 import itertools
+from collections import defaultdict, namedtuple
 from flask_cors import CORS
 import os
 import logging
@@ -25,17 +25,41 @@ from flask_limiter.util import get_remote_address
 from functools import lru_cache
 from flask_talisman import Talisman
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup, stdlib json works too
+    orjson = None
+
 # Configuration
 class Config:
     DEBUG = os.environ.get("FLASK_DEBUG", "0") == "1"
     TERMS_DIR = os.environ.get("TERMS_DIR", ".")
     CORS_ORIGINS = os.environ.get("CORS_ORIGINS", "*")
     RATE_LIMIT = os.environ.get("RATE_LIMIT", "100/hour")
+    MAX_SCHEDULES = int(os.environ.get("MAX_SCHEDULES", "500"))
 
 app = Flask(__name__)
 app.config.from_object(Config)
+
+if orjson is not None:
+    from flask.json.provider import JSONProvider
+
+    class OrjsonProvider(JSONProvider):
+        """JSON provider backed by orjson; big /api/generate_schedule
+        payloads serialize several times faster than with the default."""
+
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj)
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = OrjsonProvider(app)
+
 CORS(app, origins=app.config["CORS_ORIGINS"])
-Talisman(app)
+# The backend serves JSON only, so skip building a Content-Security-Policy
+# header per response; transport security (HTTPS/HSTS) stays on.
+Talisman(app, content_security_policy=None)
 
 # Rate limiting
 limiter = Limiter(
@@ -52,10 +76,18 @@ if not app.debug:
 TERMS_DIR = app.config["TERMS_DIR"]
 TERM_SUFFIX = 'spring.json'
 
+# Directory-scan cache for term files, invalidated by the directory's mtime.
+# Term files change a few times per semester; API requests come in constantly.
+_term_files_cache = {'mtime_ns': None, 'files': []}
+
 def get_term_files():
-    # List all files matching *_spring.json
-    files = [f for f in os.listdir(TERMS_DIR) if f.endswith(TERM_SUFFIX)]
-    return files
+    # List all files matching *_spring.json, newest term first.
+    mtime_ns = os.stat(TERMS_DIR).st_mtime_ns
+    if _term_files_cache['mtime_ns'] != mtime_ns:
+        files = sorted((f for f in os.listdir(TERMS_DIR) if f.endswith(TERM_SUFFIX)), reverse=True)
+        _term_files_cache['mtime_ns'] = mtime_ns
+        _term_files_cache['files'] = files
+    return _term_files_cache['files']
 
 def get_term_name_from_file(filename):
     # e.g., 2024_2025spring.json -> 2024-2025 Spring
@@ -67,151 +99,256 @@ def get_file_from_term(term):
     base = term.lower().replace(' ', '').replace('-', '_')
     return f"{base}.json"
 
-# Day name mapping from Turkish to English
+# Canonical day order, used for the bitmask layout and API responses
+DAYS_OF_WEEK = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+DAY_INDEX = {day: i for i, day in enumerate(DAYS_OF_WEEK)}
+
+# Day name mapping from Turkish to English. Lookups go through a normalized
+# map (Turkish I-variants folded, then casefolded), so one entry per spelling
+# covers every capitalization the source data might use.
 DAY_MAP = {
-    'PAZARTESİ': 'Monday', 'PAZARTESI': 'Monday', 'pazartesi': 'Monday',
-    'SALI': 'Tuesday', 'sali': 'Tuesday',
-    'ÇARŞAMBA': 'Wednesday', 'ÇARSAMBA': 'Wednesday', 'çarşamba': 'Wednesday', 'çarsamba': 'Wednesday',
-    'PERŞEMBE': 'Thursday', 'PERSEMBE': 'Thursday', 'perşembe': 'Thursday', 'persembe': 'Thursday',
-    'CUMA': 'Friday', 'cuma': 'Friday',
-    'CUMARTESİ': 'Saturday', 'CUMARTESI': 'Saturday', 'cumartesi': 'Saturday',
-    'PAZAR': 'Sunday', 'pazar': 'Sunday',
+    'PAZARTESİ': 'Monday',
+    'SALI': 'Tuesday',
+    'ÇARŞAMBA': 'Wednesday', 'ÇARSAMBA': 'Wednesday',
+    'PERŞEMBE': 'Thursday', 'PERSEMBE': 'Thursday',
+    'CUMA': 'Friday',
+    'CUMARTESİ': 'Saturday',
+    'PAZAR': 'Sunday',
 }
 
+# casefold() alone mishandles Turkish dotted/dotless I ('İ' -> 'i̇'), so fold
+# both onto their ASCII counterparts first.
+_TURKISH_I_FOLD = str.maketrans('ıİ', 'iI')
+
+def normalize_day(day):
+    return day.translate(_TURKISH_I_FOLD).casefold()
+
+DAY_MAP_NORM = {normalize_day(key): value for key, value in DAY_MAP.items()}
+
 def map_days_to_english(data):
+    # Runs once per term at load time, before the result is cached; nothing
+    # mutates sessions after this point.
+    day_map_get = DAY_MAP_NORM.get
     for course_code, sessions in data.items():
         for session in sessions:
-            if session['Day'] in DAY_MAP:
-                session['Day'] = DAY_MAP[session['Day']]
+            day = session['Day']
+            if day is not None:
+                session['Day'] = day_map_get(normalize_day(day), day)
     return data
 
-# Caching course data
-@lru_cache(maxsize=8)
-def load_courses_data_cached(term):
+# Caching course data. Every per-term cache below is keyed on the backing
+# file's path and mtime: replacing a term file on disk produces a new key, so
+# fresh data is picked up automatically and the stale entry ages out of the
+# LRU without any explicit invalidation.
+def term_file_version(term):
+    """Resolve a term to its data file and that file's current mtime."""
     filename = get_file_from_term(term)
     path = os.path.join(TERMS_DIR, filename)
     if not os.path.exists(path):
         # fallback to latest available
-        files = sorted(get_term_files(), reverse=True)
+        files = get_term_files()
         if not files:
             raise FileNotFoundError('No course data files found.')
         path = os.path.join(TERMS_DIR, files[0])
-    with open(path, 'r') as f:
-        data = json.load(f)
-    return map_days_to_english(data)
+    return path, os.stat(path).st_mtime_ns
 
-# Helper function to check if a session overlaps with a time slot
-def session_overlaps_slot(session, time_slot):
-    """Check if a session overlaps with a given time slot (format: 'HH:MM-HH:MM')."""
-    session_start = session['Start Time']
-    session_end = session['End Time']
-    
-    # Parse times
-    try:
-        start_hour, start_minute = map(int, session_start.split(':'))
-        end_hour, end_minute = map(int, session_end.split(':'))
-        
-        slot_start, slot_end = time_slot.split('-')
-        slot_start_hour, slot_start_minute = map(int, slot_start.split(':'))
-        slot_end_hour, slot_end_minute = map(int, slot_end.split(':'))
-        
-        # Convert to minutes for easier comparison
-        session_start_mins = start_hour * 60 + start_minute
-        session_end_mins = end_hour * 60 + end_minute
-        slot_start_mins = slot_start_hour * 60 + slot_start_minute
-        slot_end_mins = slot_end_hour * 60 + slot_end_minute
-        
-        # Check if there's an overlap
-        return (
-            # Either session starts during the slot
-            (session_start_mins <= slot_end_mins and session_start_mins >= slot_start_mins) or
-            # Or session ends during the slot
-            (session_end_mins >= slot_start_mins and session_end_mins <= slot_end_mins) or
-            # Or session completely spans the slot
-            (session_start_mins <= slot_start_mins and session_end_mins >= slot_end_mins)
-        )
-    except Exception:
-        return False
+def load_courses_data_cached(term):
+    return _load_courses_data(*term_file_version(term))
+
+@lru_cache(maxsize=4)
+def _load_courses_data(path, mtime_ns):
+    # orjson parses the multi-MB term files several times faster than the
+    # stdlib; this runs once per file version per process.
+    with open(path, 'rb') as f:
+        raw = f.read()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    return map_days_to_english(data)
 
+@lru_cache(maxsize=1024)
 def time_to_minutes(time_str):
-    """Convert time string to minutes since midnight."""
+    """Convert time string to minutes since midnight.
+
+    Memoized so repeat calls are a single dict lookup. The cache is bounded
+    because blocked-hour slots from request bodies also pass through here:
+    legitimate clock values number a few dozen, but the input is not ours
+    to trust with an unbounded cache.
+    """
     try:
         hours, minutes = map(int, time_str.split(':'))
         return hours * 60 + minutes
     except Exception:
         return 0
 
-def check_no_overlaps(all_sessions):
-    """Check if sessions have no time overlaps when grouped by day."""
-    sessions_by_day = defaultdict(list)
-    for session in all_sessions:
-        day = session['Day']
-        start = time_to_minutes(session['Start Time'])
-        end = time_to_minutes(session['End Time'])
-        sessions_by_day[day].append((start, end))
-    for day, day_sessions in sessions_by_day.items():
-        day_sessions.sort(key=lambda x: x[0])
-        for i in range(1, len(day_sessions)):
-            if day_sessions[i][0] < day_sessions[i-1][1]:
-                return False
-    return True
+# Bitmask layout for the schedule search: every 5-minute bin of the week gets
+# one bit, so testing a section against a partial schedule is a single int AND.
+MASK_BIN_MINUTES = 5
+MASK_BINS_PER_DAY = (24 * 60) // MASK_BIN_MINUTES
 
-def session_overlaps_blocked(session, blocked_set):
-    """Check if a session overlaps with any blocked time slot."""
+def session_bitmask(session):
+    """Bitmask of the 5-minute bins of the week this session occupies."""
+    day_idx = DAY_INDEX.get(session['Day'])
+    if day_idx is None:
+        return 0
+    start_bin = time_to_minutes(session['Start Time']) // MASK_BIN_MINUTES
+    end_min = time_to_minutes(session['End Time'])
+    end_bin = -(-end_min // MASK_BIN_MINUTES)  # ceil, so partial bins count
+    if end_bin <= start_bin:
+        return 0
+    offset = day_idx * MASK_BINS_PER_DAY + start_bin
+    return ((1 << (end_bin - start_bin)) - 1) << offset
+
+def section_bitmask(sessions):
+    """Combined occupancy bitmask for all sessions of a section."""
+    mask = 0
+    for session in sessions:
+        mask |= session_bitmask(session)
+    return mask
+
+def section_intervals(sessions):
+    """Per-session integer intervals: (day, start_min, end_min, 'HH:MM-HH:MM').
+
+    Computed once per section so the search never has to re-parse time
+    strings while exploring combinations.
+    """
+    return [
+        (
+            session['Day'],
+            time_to_minutes(session['Start Time']),
+            time_to_minutes(session['End Time']),
+            f"{session['Start Time']}-{session['End Time']}",
+        )
+        for session in sessions
+    ]
+
+def build_blocked_by_day(blocked_set):
+    """Convert blocked (day, 'HH:MM-HH:MM') slots to sorted integer minute
+    intervals per day, so overlap checks never re-parse slot strings. The
+    original slot string rides along for warning messages."""
+    blocked_by_day = defaultdict(list)
     for day, slot in blocked_set:
-        if session['Day'] != day:
-            continue
         slot_start, slot_end = slot.split('-')
-        sess_start = session['Start Time']
-        sess_end = session['End Time']
-        if not (sess_end <= slot_start or sess_start >= slot_end):
-            return True
+        blocked_by_day[day].append((time_to_minutes(slot_start), time_to_minutes(slot_end), slot))
+    for day_intervals in blocked_by_day.values():
+        day_intervals.sort()
+    return blocked_by_day
+
+def section_overlaps_blocked(intervals, blocked_by_day):
+    """Check if any of a section's intervals overlaps a blocked slot."""
+    for day, start, end, _ in intervals:
+        for blocked_start, blocked_end, _ in blocked_by_day.get(day, ()):
+            # Canonical interval-overlap test: two ranges intersect iff each
+            # starts before the other ends.
+            if start < blocked_end and blocked_start < end:
+                return True
     return False
 
 def build_eligible_sections(data):
-    """Build eligible sections from course data."""
-    courses = defaultdict(lambda: defaultdict(list))
+    """Build eligible sections from course data in a single pass.
+
+    A section is eligible only if every one of its sessions has a day and
+    both times; sections where any session is missing one are dropped whole.
+    """
+    eligible_sections = {}
     for course_code, sessions in data.items():
+        by_section = {}
+        incomplete = set()
         for session in sessions:
             section = session['Section']
-            courses[course_code][section].append(session)
-    
-    eligible_sections = defaultdict(list)
-    for course_code, sections in courses.items():
-        for section, sessions in sections.items():
-            if all(session['Day'] is not None and session['Start Time'] is not None and session['End Time'] is not None for session in sessions):
-                eligible_sections[course_code].append((section, sessions))
-    
+            if session['Day'] is None or session['Start Time'] is None or session['End Time'] is None:
+                incomplete.add(section)
+                continue
+            by_section.setdefault(section, []).append(session)
+        entries = [(section, section_sessions)
+                   for section, section_sessions in by_section.items()
+                   if section not in incomplete]
+        if entries:
+            eligible_sections[course_code] = entries
     return eligible_sections
 
-# Add a new function to identify specific blocked hours causing conflicts
-def identify_conflicting_hours(course, eligible_sections, blocked_set):
-    """Identify which blocked hours conflict with which course sections."""
+def identify_conflicting_hours(course, eligible_sections, blocked_by_day):
+    """Identify which blocked hours conflict with which course sections.
+
+    Works entirely on the precomputed integer intervals; no time strings
+    are parsed here.
+    """
     conflicts = defaultdict(list)
-    
-    # For each section of the course
-    for section, sessions in eligible_sections.get(course, []):
-        # Check each session for conflicts with blocked hours
-        for session in sessions:
-            # Find conflicting blocked hours for this session
-            for day, slot in blocked_set:
-                if session['Day'] != day:
-                    continue
-                    
-                slot_start, slot_end = slot.split('-')
-                sess_start = session['Start Time']
-                sess_end = session['End Time']
-                
-                if not (sess_end <= slot_start or sess_start >= slot_end):
+    for section, sessions, _, intervals in eligible_sections.get(course, ()):
+        for (day, start, end, time_str), session in zip(intervals, sessions):
+            for blocked_start, blocked_end, slot in blocked_by_day.get(day, ()):
+                if start < blocked_end and blocked_start < end:
                     conflicts[section].append({
-                        'day': day, 
-                        'slot': slot, 
-                        'session_time': f"{sess_start}-{sess_end}",
+                        'day': day,
+                        'slot': slot,
+                        'session_time': time_str,
                         'classroom': session.get('Classroom', 'Unknown')
                     })
-    
     return conflicts
 
+# Per-term prepared data: normalized course data plus eligible sections with
+# their occupancy bitmask and integer intervals already attached, so request
+# handlers never rebuild any of it.
+PreparedTerm = namedtuple('PreparedTerm', ['data', 'eligible_sections'])
+
+def get_prepared_term(term):
+    """Load and pre-index a term's course data once per file version."""
+    return _prepare_term(*term_file_version(term))
+
+@lru_cache(maxsize=8)
+def _prepare_term(path, mtime_ns):
+    data = _load_courses_data(path, mtime_ns)
+    eligible_sections = {}
+    for course_code, sections in build_eligible_sections(data).items():
+        eligible_sections[course_code] = tuple(
+            (section, sessions, section_bitmask(sessions), section_intervals(sessions))
+            for section, sessions in sections
+        )
+    return PreparedTerm(data, eligible_sections)
+
+# Pre-serialized responses for the read-only endpoints. Both payloads are
+# pure functions of the term file, so the JSON bytes are built once per
+# file version.
+def get_grouped_courses_json(term):
+    """Serialized /api/courses payload: course codes grouped by prefix."""
+    return _grouped_courses_json(*term_file_version(term))
+
+@lru_cache(maxsize=8)
+def _grouped_courses_json(path, mtime_ns):
+    data = _prepare_term(path, mtime_ns).data
+    grouped_courses = defaultdict(list)
+    for course in data:
+        grouped_courses[course.split()[0]].append(course)
+    return json.dumps(grouped_courses).encode('utf-8')
+
+def get_section_map_json(term):
+    """Serialized /api/sections payload: eligible section names per course."""
+    return _section_map_json(*term_file_version(term))
+
+@lru_cache(maxsize=8)
+def _section_map_json(path, mtime_ns):
+    section_map = {
+        course_code: [entry[0] for entry in sections]
+        for course_code, sections in _prepare_term(path, mtime_ns).eligible_sections.items()
+    }
+    return json.dumps(section_map).encode('utf-8')
+
+def warm_term_caches():
+    """Eagerly prepare every available term at import time.
+
+    With gunicorn's --preload, workers are forked after this runs, so the
+    parsed course data and prepared indexes are shared copy-on-write across
+    workers and no request ever pays the cold-cache cost.
+    """
+    for filename in get_term_files():
+        term = get_term_name_from_file(filename)
+        try:
+            get_prepared_term(term)
+            get_grouped_courses_json(term)
+            get_section_map_json(term)
+        except Exception as e:
+            app.logger.error(f"Failed to warm caches for term '{term}': {e}")
+
+warm_term_caches()
+
 @app.route('/')
 def index():
     return "YU Scheduler API is running."
@@ -221,7 +358,7 @@ def index():
 def api_terms():
     try:
         files = get_term_files()
-        terms = [get_term_name_from_file(f) for f in sorted(files, reverse=True)]
+        terms = [get_term_name_from_file(f) for f in files]
         return jsonify(terms)
     except Exception as e:
         app.logger.error(f"/api/terms error: {e}")
@@ -234,15 +371,9 @@ def api_courses():
         term = request.args.get('term')
         if not term:
             # Default to latest
-            files = sorted(get_term_files(), reverse=True)
+            files = get_term_files()
             term = get_term_name_from_file(files[0]) if files else None
-        data = load_courses_data_cached(term)
-        course_list = list(data.keys())
-        grouped_courses = defaultdict(list)
-        for course in course_list:
-            prefix = course.split()[0]
-            grouped_courses[prefix].append(course)
-        return jsonify({k: v for k, v in grouped_courses.items()})
+        return Response(get_grouped_courses_json(term), mimetype='application/json')
     except Exception as e:
         app.logger.error(f"/api/courses error: {e}")
         return make_response(jsonify({"error": "Internal server error"}), 500)
@@ -272,12 +403,13 @@ def api_generate_schedule():
         term = req_data.get('term')
         try:
             if not term:
-                files = sorted(get_term_files(), reverse=True)
+                files = get_term_files()
                 if not files:
                     return make_response(jsonify({"error": "No course data available"}), 404)
                 term = get_term_name_from_file(files[0])
-            
-            data = load_courses_data_cached(term)
+
+            prepared = get_prepared_term(term)
+            data = prepared.data
         except FileNotFoundError as e:
             app.logger.error(f"Term data not found: {term}, error: {e}")
             return make_response(jsonify({"error": f"Course data for term '{term}' not found"}), 404)
@@ -285,8 +417,7 @@ def api_generate_schedule():
             app.logger.error(f"Invalid JSON in term file for {term}: {e}")
             return make_response(jsonify({"error": "Internal data error. Please try again later."}), 500)
         
-        # Build eligible sections
-        eligible_sections = build_eligible_sections(data)
+        eligible_sections = prepared.eligible_sections
 
         # Process selected courses
         selected_courses = req_data.get('courses', [])
@@ -303,6 +434,10 @@ def api_generate_schedule():
                 if not isinstance(block, dict) or 'day' not in block or 'slot' not in block:
                     return make_response(jsonify({"error": "Invalid blocked hour format. Each entry must have 'day' and 'slot'"}), 400)
                 blocked_set.add((block['day'], block['slot']))
+            # One-shot conversion of blocked slots to integer intervals per
+            # day; a slot that is not 'HH:MM-HH:MM' fails the split here and
+            # is rejected below rather than surfacing as a 500 later.
+            blocked_by_day = build_blocked_by_day(blocked_set)
         except Exception as e:
             app.logger.error(f"Error processing blocked hours: {e}")
             return make_response(jsonify({"error": "Invalid blocked hours format"}), 400)
@@ -330,29 +465,31 @@ def api_generate_schedule():
                     continue
                     
                 filtered = []
-                conflicts = identify_conflicting_hours(course, eligible_sections, blocked_set)
-                
+
                 if section_choice:
-                    for section, sessions in eligible_sections.get(course, []):
+                    for entry in eligible_sections.get(course, ()):
+                        section = entry[0]
                         if section == section_choice:
-                            if not any(session_overlaps_blocked(sess, blocked_set) for sess in sessions):
-                                filtered.append((section, sessions))
+                            if not section_overlaps_blocked(entry[3], blocked_by_day):
+                                filtered.append(entry)
                             else:
-                                # Store conflicts for this specific section
-                                course_conflicts[course] = conflicts.get(section, [])
+                                # Explain the exclusion for this specific section only
+                                conflicts = identify_conflicting_hours(course, eligible_sections, blocked_by_day)
+                                course_conflicts[course] = {section: conflicts.get(section, [])}
                             break
                 else:
                     # Check all available sections
                     has_conflicts = False
-                    for section, sessions in eligible_sections.get(course, []):
-                        if not any(session_overlaps_blocked(sess, blocked_set) for sess in sessions):
-                            filtered.append((section, sessions))
+                    for entry in eligible_sections.get(course, ()):
+                        if not section_overlaps_blocked(entry[3], blocked_by_day):
+                            filtered.append(entry)
                         else:
                             has_conflicts = True
-                    
-                    # If at least one section has conflicts, store them
+
+                    # Conflict details are only needed when the course is
+                    # excluded outright, so compute them just for that case
                     if has_conflicts and not filtered:
-                        course_conflicts[course] = conflicts
+                        course_conflicts[course] = identify_conflicting_hours(course, eligible_sections, blocked_by_day)
                 
                 if filtered:
                     valid_courses.append(course)
@@ -410,77 +547,124 @@ def api_generate_schedule():
             
             return jsonify({"warnings": warnings, "schedules": [], "error": "No valid courses to schedule"})
 
-        # Generate schedule combinations
-        try:
-            section_lists = [filtered_sections[course] for course in valid_courses]
-            combinations = list(itertools.product(*section_lists))
-        except Exception as e:
-            app.logger.error(f"Error generating combinations: {e}")
-            return make_response(jsonify({"error": "Failed to generate schedule combinations"}), 500)
-
-        # Find valid schedules
+        # Collapse sections that share an identical weekly time pattern (same
+        # occupancy bitmask): the search walks one representative per pattern
+        # and valid pattern combinations are expanded back to concrete
+        # sections at the leaves.
+        groups_by_course = {}
+        for course in valid_courses:
+            pattern_groups = {}
+            for entry in filtered_sections[course]:
+                pattern_groups.setdefault(entry[2], []).append(entry)
+            groups_by_course[course] = list(pattern_groups.values())
+
+        # Most-constrained-first: order courses by their real branching factor
+        # (distinct time patterns, not raw section count) so the search hits
+        # dead ends as early as possible. Within a course, try patterns that
+        # occupy fewer time bins first — they are the least likely to clash.
+        valid_courses.sort(key=lambda course: len(groups_by_course[course]))
+        section_lists = [
+            sorted(groups_by_course[course], key=lambda group: bin(group[0][2]).count('1'))
+            for course in valid_courses
+        ]
+
+        # Find valid schedules with a backtracking search: keep a running
+        # occupancy mask and prune a branch the moment a section conflicts,
+        # instead of materializing and re-checking the full Cartesian product.
         valid_schedules = []
         conflict_pairs = []  # Store courses that conflict with each other
-
-        for combination in combinations:
-            try:
-                all_sessions = []
-                for section in combination:
-                    all_sessions.extend(section[1])
-                
-                # Check for overlaps
-                if check_no_overlaps(all_sessions):
-                    schedule = {
+        seen_conflicts = set()  # Dedup guard for conflict_pairs
+
+        def record_conflicts(course, section, intervals, chosen):
+            """Record session-level overlaps between a pruned candidate section
+            and the sections already placed on the partial schedule."""
+            for prev_idx, group in enumerate(chosen):
+                prev_section, _, _, prev_intervals = group[0]
+                prev_course = valid_courses[prev_idx]
+                for prev_day, prev_start, prev_end, prev_time in prev_intervals:
+                    for day, start, end, time_str in intervals:
+                        if prev_day != day:
+                            continue
+                        if prev_start < end and start < prev_end:
+                            first = (prev_course, prev_section, prev_time)
+                            second = (course, section, time_str)
+                            if start < prev_start:
+                                first, second = second, first
+                            # Format: (course1, section1, time1, course2, section2, time2, day)
+                            conflict_info = first + second + (day,)
+                            if conflict_info not in seen_conflicts:
+                                seen_conflicts.add(conflict_info)
+                                conflict_pairs.append(conflict_info)
+
+        max_schedules = app.config["MAX_SCHEDULES"]
+
+        def search(idx, occupied, chosen, record=False):
+            """Explore section choices for courses[idx:]. Returns True once a
+            schedule beyond the cap is found, which unwinds the whole search;
+            the overflow schedule is trimmed off by the caller.
+
+            Conflict pairs are only recorded when `record` is set; they are
+            purely diagnostic and only shown when no schedule exists at all.
+            """
+            if idx == len(section_lists):
+                # Expand the chosen pattern groups back to concrete sections
+                for combo in itertools.product(*chosen):
+                    valid_schedules.append({
                         'sections': [
                             {
                                 'course': course,
-                                'section': section[0],
-                                'sessions': section[1]
+                                'section': entry[0],
+                                'sessions': entry[1]
                             }
-                            for course, section in zip(valid_courses, combination)
+                            for course, entry in zip(valid_courses, combo)
                         ]
-                    }
-                    valid_schedules.append(schedule)
-                else:
-                    # Find which specific courses conflict with each other
-                    sessions_by_day = defaultdict(list)
-                    course_sessions = {}
-                    
-                    # Group sessions by day and map to courses
-                    for i, section in enumerate(combination):
-                        course = valid_courses[i]
-                        for session in section[1]:
-                            day = session['Day']
-                            start = time_to_minutes(session['Start Time'])
-                            end = time_to_minutes(session['End Time'])
-                            sessions_by_day[day].append((start, end, course, section[0]))
-                            course_sessions[(course, section[0], day, start, end)] = session
-                    
-                    # Check for conflicts on each day
-                    for day, sessions in sessions_by_day.items():
-                        sessions.sort(key=lambda x: x[0])  # Sort by start time
-                        for i in range(len(sessions)):
-                            for j in range(i + 1, len(sessions)):
-                                s1 = sessions[i]
-                                s2 = sessions[j]
-                                # Check if sessions overlap
-                                if s1[0] < s2[1] and s2[0] < s1[1]:
-                                    # Format: (course1, section1, time1, course2, section2, time2, day)
-                                    conflict_info = (
-                                        s1[2], s1[3], f"{course_sessions[(s1[2], s1[3], day, s1[0], s1[1])]['Start Time']}-{course_sessions[(s1[2], s1[3], day, s1[0], s1[1])]['End Time']}",
-                                        s2[2], s2[3], f"{course_sessions[(s2[2], s2[3], day, s2[0], s2[1])]['Start Time']}-{course_sessions[(s2[2], s2[3], day, s2[0], s2[1])]['End Time']}",
-                                        day
-                                    )
-                                    if conflict_info not in conflict_pairs:
-                                        conflict_pairs.append(conflict_info)
-            except Exception as e:
-                app.logger.error(f"Error processing combination {combination}: {e}", exc_info=True)
-                continue
+                    })
+                    if len(valid_schedules) > max_schedules:
+                        return True
+                return False
+            course = valid_courses[idx]
+            for group in section_lists[idx]:
+                section, _, mask, intervals = group[0]
+                if occupied & mask:
+                    if record:
+                        record_conflicts(course, section, intervals, chosen)
+                    continue
+                chosen.append(group)
+                capped = search(idx + 1, occupied | mask, chosen, record)
+                chosen.pop()
+                if capped:
+                    return True
+            return False
 
-        time_slots = ['08:40-09:30', '09:40-10:30', '10:40-11:30', '11:40-12:30', 
-                     '12:40-13:30', '13:40-14:30', '14:40-15:30', '15:40-16:30', 
+        try:
+            if len(section_lists) == 1:
+                # Trivial case: every section of the lone course is a schedule
+                # of its own, so skip the search machinery entirely.
+                course = valid_courses[0]
+                entries = [entry for group in section_lists[0] for entry in group]
+                for section, sessions, _, _ in entries[:max_schedules]:
+                    valid_schedules.append({
+                        'sections': [{'course': course, 'section': section, 'sessions': sessions}]
+                    })
+                capped = len(entries) > max_schedules
+            else:
+                capped = search(0, 0, [])
+            if capped:
+                del valid_schedules[max_schedules:]
+                warnings.append(f"Only the first {max_schedules} schedules are shown. Block some hours or pick specific sections to narrow the results.")
+            if not valid_schedules and len(section_lists) > 1:
+                # No schedule exists: re-walk the (tiny, every branch dies
+                # early) search tree once more to collect which course pairs
+                # collide, for the warning messages below.
+                search(0, 0, [], record=True)
+        except Exception as e:
+            app.logger.error(f"Error during schedule search: {e}", exc_info=True)
+            return make_response(jsonify({"error": "Failed to generate schedule combinations"}), 500)
+
+        time_slots = ['08:40-09:30', '09:40-10:30', '10:40-11:30', '11:40-12:30',
+                     '12:40-13:30', '13:40-14:30', '14:40-15:30', '15:40-16:30',
                      '16:40-17:30', '17:40-18:30', '18:40-19:30', '19:40-20:30', '20:40-21:30', '21:40-22:30']
-        days_of_week = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+        days_of_week = DAYS_OF_WEEK
 
         if not valid_schedules:
             if conflict_pairs:
@@ -525,17 +709,9 @@ def api_sections():
     try:
         term = request.args.get('term')
         if not term:
-            files = sorted(get_term_files(), reverse=True)
+            files = get_term_files()
             term = get_term_name_from_file(files[0]) if files else None
-        data = load_courses_data_cached(term)
-        
-        # Build eligible sections
-        eligible_sections = build_eligible_sections(data)
-        
-        section_map = {}
-        for course_code, sections in eligible_sections.items():
-            section_map[course_code] = [section for section, _ in sections]
-        return jsonify(section_map)
+        return Response(get_section_map_json(term), mimetype='application/json')
     except Exception as e:
         app.logger.error(f"/api/sections error: {e}")
         return make_response(jsonify({"error": "Internal server error"}), 500)